@@ -22,19 +22,7 @@
 
 
 import argparse
-import base64
-import datetime
-import json
-import os
-import platform
-import pwd
 import re
-import shutil
-import socket
-import subprocess
-import sys
-import threading
-import time
 import zipfile
 
 def ParseArgs():
@@ -66,47 +54,11 @@ def GenerateCombinedODS():
 
     def GetContentXMLFromODS( odssrc ):
         """Extract content.xml from an ODS file, where the sheet lives."""
-        ziparchive = zipfile.ZipFile( odssrc )
-        content = ziparchive.read("content.xml")
+        with zipfile.ZipFile( odssrc ) as ziparchive:
+            content = ziparchive.read("content.xml")
         content = content.replace("\n", "")
         return content
 
-    def CSVtoXMLSheet(sheetName, csvName):
-        """Replace a named sheet with the contents of a CSV file."""
-        newt  = '<table:table table:name='
-        newt += '"' + sheetName + '"' + ' table:style-name="ta1" > '
-        newt += '<table:table-column table:style-name="co1" '
-        newt += 'table:default-cell-style-name="Default"/>'
-        # Insert the rows, one entry at a time
-        with open(csvName) as f:
-            for line in f:
-                line = line.rstrip()
-                newt += '<table:table-row table:style-name="ro1">'
-                for val in line.split(','):
-                    try:
-                        cell  = '<table:table-cell office:value-type="float" '
-                        cell += 'office:value="' + str(float(val))
-                        cell += '"><text:p>'
-                        cell += str(float(val)) + '</text:p></table:table-cell>'
-                    except: # It's not a float, so let's call it a string
-                        cell  = '<table:table-cell office:value-type="string" '
-                        cell += '><text:p>'
-                        cell += str(val) + '</text:p></table:table-cell>'
-                    newt += cell
-                newt += '</table:table-row>'
-            f.close()
-        # Close the tags
-        newt += '</table:table>'
-        return newt
-
-    def AppendSheetFromCSV(sheetName, csvName, xmltext):
-        """Add a new sheet to the XML from the CSV file."""
-        newt = CSVtoXMLSheet(sheetName, csvName)
-
-        # Replace the XML using lazy string matching
-        searchstr  = '<table:named-expressions/>'
-        return re.sub(searchstr, newt + searchstr, xmltext)
-
     def UpdateContentXMLToODS_text( odssrc, odsdest, xmltext ):
         """Replace content.xml in an ODS w/an in-memory copy and write new.
 
@@ -121,87 +73,71 @@ def GenerateCombinedODS():
         """
         global suffix
 
-        if os.path.exists(odsdest):
-            os.unlink(odsdest)
-
-        # Windows ZipArchive will not use "Store" even with "no compression"
-        # so we need to have a mimetype.zip file encoded below to match spec:
-        mimetypezip = """
-UEsDBAoAAAAAAOKbNUiFbDmKLgAAAC4AAAAIAAAAbWltZXR5cGVhcHBsaWNhdGlvbi92bmQub2Fz
-aXMub3BlbmRvY3VtZW50LnNwcmVhZHNoZWV0UEsBAj8ACgAAAAAA4ps1SIVsOYouAAAALgAAAAgA
-JAAAAAAAAACAAAAAAAAAAG1pbWV0eXBlCgAgAAAAAAABABgAAAyCUsVU0QFH/eNMmlTRAUf940ya
-VNEBUEsFBgAAAAABAAEAWgAAAFQAAAAAAA==
-"""
-        zipbytes = base64.b64decode( mimetypezip )
-        with open(odsdest, 'wb') as f:
-            f.write(zipbytes)
-
-        zasrc = zipfile.ZipFile(odssrc, 'r')
-        zadst = zipfile.ZipFile(odsdest, 'a', zipfile.ZIP_DEFLATED)
-        for entry in zasrc.namelist():
-            if entry == "mimetype":
-                continue
-            elif entry.endswith('/') or entry.endswith('\\'):
-                continue
-            elif entry == "content.xml":
-                zadst.writestr( "content.xml", xmltext)
-            elif ("Object" in entry) and ("content.xml" in entry):
-                # Remove <table:table table:name="local-table"> table
-                rdbytes = zasrc.read(entry)
-                outbytes = re.sub('<table:table table:name="local-table">.*</table:table>', "", rdbytes)
-                # Add in extra chart series following existing format...
-                searchStr = '<chart:series .*</chart:series>'
-                match = re.search(searchStr, outbytes);
-                addl = ""
-                if match:
-                    fmt = match.group(0)
-                    addl = fmt;
-                    for sheet in [ "Tests", "Timeseries", "Exceedance"]:
-                        addl = re.sub( sheet, sheet+suffix, addl )
-                    # Remove any existing label and add updated one
-                    addl = re.sub("loext:label-string=\".*?\"" , "", addl );
-                    addl = re.sub ("<chart:series ", "<chart:series " + "loext:label-string=\""+suffix+"\" ", addl) 
-                    styleMatch = re.search("chart:style-name=\"(.)*?\"", fmt)
-                    if styleMatch:
-                        styleName = re.sub("chart:style-name=\"", "", styleMatch.group(0) )
-                        styleName = re.sub("\".*", "", styleName)
-                        # Change the style requested in new one...
-                        addl = re.sub( "\"" + styleName + "\"", "\"" + styleName + suffix + "\"", addl )
-                        # And patch in the new chart:series entry
-                        outbytes = re.sub ( searchStr, fmt + addl, outbytes )
-                        # Now make the new style...
-                        oldStyleMatch = re.search( "<style:style style:name=\"" + styleName + ".*?</style:style>" , outbytes )
-                        if oldStyleMatch:
-                            oldStyle = oldStyleMatch.group(0)
-                            newStyle = re.sub( "\"" + styleName + "\"", "\"" + styleName + suffix + "\"", oldStyle)
-                            # Change the embedded color:
-                            newStyle = re.sub( "svg:stroke-color=\"#.*?\"", "svg:stroke-color=\"#" + color + "\"", newStyle )
-                            # Add in the new style...
-                            outbytes = re.sub ( oldStyle, oldStyle + newStyle, outbytes )
-                        # Add legend if it doesn't exist
-                        legendMatch = re.search("<chart:legend .*?/>", outbytes)
-                        if not legendMatch:
-                            # Put in hardcoded one...looks like junk, but can be tweaked by user in application
-                            legend = "<chart:legend chart:legend-position=\"bottom\" svg:x=\"0.000cm\" svg:y=\"0.000cm\" style:legend-expansion=\"wide\" chart:style-name=\"ch3\"/>";
-                            outbytes = re.sub ("</chart:title>", "</chart:title>" + legend, outbytes )
-                zadst.writestr(entry, outbytes)
-            elif entry == "META-INF/manifest.xml":
-                # Remove ObjectReplacements from the list
-                rdbytes = zasrc.read(entry)
-                outbytes = ""
-                lines = rdbytes.split("\n")
-                for line in lines:
-                    if not ( ("ObjectReplacement" in line) or ("Thumbnails" in line) ):
-                        outbytes = outbytes + line + "\n"
-                zadst.writestr(entry, outbytes)
-            elif ("Thumbnails" in entry) or ("ObjectReplacement" in entry):
-                # Skip binary versions
-                continue
-            else:
-                rdbytes = zasrc.read(entry)
-                zadst.writestr(entry, rdbytes)
-        zasrc.close()
-        zadst.close()
+        # Write the whole archive in one pass, no reopening it to append
+        with zipfile.ZipFile(odssrc, 'r') as zasrc, \
+             zipfile.ZipFile(odsdest, 'w', zipfile.ZIP_DEFLATED) as zadst:
+            # The ODF spec requires "mimetype" be the first entry, uncompressed
+            mimetype = zipfile.ZipInfo("mimetype")
+            mimetype.compress_type = zipfile.ZIP_STORED
+            zadst.writestr(mimetype, odsMimetype)
+            for entry in zasrc.namelist():
+                if entry == "mimetype":
+                    continue
+                elif entry.endswith('/') or entry.endswith('\\'):
+                    continue
+                elif entry == "content.xml":
+                    zadst.writestr( "content.xml", xmltext)
+                elif ("Object" in entry) and ("content.xml" in entry):
+                    # Remove <table:table table:name="local-table"> table
+                    rdbytes = zasrc.read(entry)
+                    outbytes = localTableRE.sub("", rdbytes)
+                    # Add in extra chart series following existing format...
+                    match = seriesRE.search(outbytes);
+                    addl = ""
+                    if match:
+                        fmt = match.group(0)
+                        addl = fmt;
+                        for sheet in [ "Tests", "Timeseries", "Exceedance"]:
+                            addl = addl.replace( sheet, sheet+suffix )
+                        # Remove any existing label and add updated one
+                        addl = labelRE.sub("", addl );
+                        addl = addl.replace( "<chart:series ", "<chart:series " + "loext:label-string=\""+suffix+"\" " )
+                        styleMatch = styleNameRE.search(fmt)
+                        if styleMatch:
+                            styleName = re.sub("chart:style-name=\"", "", styleMatch.group(0) )
+                            styleName = re.sub("\".*", "", styleName)
+                            # Change the style requested in new one...
+                            addl = addl.replace( "\"" + styleName + "\"", "\"" + styleName + suffix + "\"" )
+                            # And patch in the new chart:series entry
+                            outbytes = outbytes[:match.end()] + addl + outbytes[match.end():]
+                            # Now make the new style...
+                            oldStyleMatch = re.search( "<style:style style:name=\"" + re.escape(styleName) + ".*?</style:style>" , outbytes )
+                            if oldStyleMatch:
+                                oldStyle = oldStyleMatch.group(0)
+                                newStyle = oldStyle.replace( "\"" + styleName + "\"", "\"" + styleName + suffix + "\"" )
+                                # Change the embedded color:
+                                newStyle = strokeColorRE.sub( "svg:stroke-color=\"#" + color + "\"", newStyle )
+                                # Add in the new style...
+                                outbytes = outbytes.replace( oldStyle, oldStyle + newStyle )
+                            # Add legend if it doesn't exist
+                            legendMatch = legendRE.search(outbytes)
+                            if not legendMatch:
+                                # Put in hardcoded one...looks like junk, but can be tweaked by user in application
+                                outbytes = outbytes.replace( "</chart:title>", "</chart:title>" + chartLegend )
+                    zadst.writestr(entry, outbytes)
+                elif entry == "META-INF/manifest.xml":
+                    # Remove ObjectReplacements from the list
+                    rdbytes = zasrc.read(entry)
+                    lines = rdbytes.split("\n")
+                    outbytes = "".join( line + "\n" for line in lines
+                        if not ( ("ObjectReplacement" in line) or ("Thumbnails" in line) ) )
+                    zadst.writestr(entry, outbytes)
+                elif ("Thumbnails" in entry) or ("ObjectReplacement" in entry):
+                    # Skip binary versions
+                    continue
+                else:
+                    rdbytes = zasrc.read(entry)
+                    zadst.writestr(entry, rdbytes)
 
 
     global sourceODS, appendODS, destODS
@@ -209,18 +145,34 @@ VNEBUEsFBgAAAAABAAEAWgAAAFQAAAAAAA==
     # First rename and append the extra data sheets
     xmlsrc = GetContentXMLFromODS( sourceODS )
     xmlapp = GetContentXMLFromODS( appendODS )
+    sheets = []
     for tableName in [ "Tests", "Timeseries", "Exceedance" ]:
         searchStr = '<table:table table:name="' + tableName + '".*?</table:table>'
         sheetMatch = re.search(searchStr, xmlapp);
         if sheetMatch:
             sheet = sheetMatch.group(0)
             # Rename the table
-            sheet = re.sub( '"' + tableName + '"', '"' + tableName + suffix + '"', sheet);
-            # Stick it right before the end of the list
-            searchStr  = '<table:named-expressions/>'
-            xmlsrc = re.sub(searchStr, sheet + searchStr, xmlsrc)
+            sheet = sheet.replace( '"' + tableName + '"', '"' + tableName + suffix + '"' )
+            sheets.append( sheet )
+    # Stick them all right before the end of the list in a single pass over
+    # the document, instead of copying the whole thing once per sheet.  A
+    # literal replace also keeps any backslashes in the sheets intact
+    searchStr  = '<table:named-expressions/>'
+    xmlsrc = xmlsrc.replace( searchStr, "".join( sheets ) + searchStr )
     UpdateContentXMLToODS_text( sourceODS, destODS, xmlsrc )
 
+odsMimetype = "application/vnd.oasis.opendocument.spreadsheet"
+
+# Chart XML patterns, compiled once instead of on every chart Object
+localTableRE = re.compile('<table:table table:name="local-table">.*</table:table>')
+seriesRE = re.compile('<chart:series .*</chart:series>')
+labelRE = re.compile("loext:label-string=\".*?\"")
+styleNameRE = re.compile("chart:style-name=\"(.)*?\"")
+strokeColorRE = re.compile("svg:stroke-color=\"#.*?\"")
+legendRE = re.compile("<chart:legend .*?/>")
+# Legend added to charts without one
+chartLegend = "<chart:legend chart:legend-position=\"bottom\" svg:x=\"0.000cm\" svg:y=\"0.000cm\" style:legend-expansion=\"wide\" chart:style-name=\"ch3\"/>"
+
 sourceODS = ""
 appendODS = ""
 destODS = ""
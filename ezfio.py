@@ -29,23 +29,32 @@ and re-run the script."""
 
 from __future__ import print_function
 import argparse
-import base64
-from collections import OrderedDict
+from array import array
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait
 import datetime
 import glob
+from itertools import accumulate, groupby, zip_longest
 import json
+from operator import add
 import os
 import platform
 import pwd
 import re
 import shutil
 import socket
+import stat
 import subprocess
 import sys
 import tempfile
-import threading
 import time
-import zipfile
+import traceback
+
+# orjson parses large json+ reports several times faster, but is optional
+try:
+    from orjson import loads as JSONLoads
+except ImportError:
+    from json import loads as JSONLoads
 
 
 def AppendFile(text, filename):
@@ -55,14 +64,49 @@ def AppendFile(text, filename):
         f.write("\n")
 
 
-def Run(cmd):
+def AppendLines(lines, filename):
+    """Append a list of lines to a text file with a single open and write."""
+    with open(filename, "a") as f:
+        f.write("".join([line + "\n" for line in lines]))
+
+
+def Run(cmd, text=True):
     """Run a cmd[], return the exit code, stdout, and stderr."""
-    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE,
+    return RunWait(RunStart(cmd), text)
+
+
+def RunStart(cmd):
+    """Start a cmd[] in the background, collect its results with RunWait()."""
+    return subprocess.Popen(cmd, stdout=subprocess.PIPE,
                             stderr=subprocess.PIPE)
-    out = proc.stdout.read()
-    err = proc.stderr.read()
-    code = proc.wait()
-    return int(code), out.decode('UTF-8'), err.decode('UTF-8')
+
+
+def RunWait(proc, text=True):
+    """Wait for a RunStart() cmd, return the exit code, stdout, and stderr.
+
+    With text=False the raw bytes are returned, for output that is usually
+    thrown away and only needs decoding when reporting an error.
+    """
+    # Drain both pipes together, a chatty stderr could otherwise fill its
+    # pipe and hang the child while we're still blocked reading stdout
+    out, err = proc.communicate()
+    if not text:
+        return int(proc.returncode), out, err
+    return int(proc.returncode), out.decode('UTF-8'), err.decode('UTF-8')
+
+
+def LoadFIOJSON(filename):
+    """Parse a FIO JSON report file, skipping any notes printed before it."""
+    with open(filename, 'rb', buffering=1 << 20) as f:
+        # Chomp anything before the json.
+        while True:
+            pos = f.tell()
+            line = f.readline()
+            if not line or b'{' in line:
+                break
+        if line:
+            f.seek(pos + line.index(b'{'))
+        return JSONLoads(f.read())
 
 
 def CheckAdmin():
@@ -99,7 +143,8 @@ def CheckFIOVersion():
     code, out, err = Run([fio, '--version'])
     try:
         fioVerString = out.split('\n')[0].rstrip()
-        ver = out.split('\n')[0].rstrip().split('-')[1].split('.')[0]
+        vernums = fioVerString.split('-')[1].split('.')
+        ver = vernums[0]
         if int(ver) < 2:
             sys.stderr.write("ERROR: FIO version " + ver + " unsupported, ")
             sys.stderr.write("version 2.0 or later required.  Exiting.\n")
@@ -110,11 +155,11 @@ def CheckFIOVersion():
         sys.exit(2)
     # Now see if we can make exceedance charts
     # Can't just try --output-format=json+ because the FIO in Ubuntu 16.04
-    # repo doesn't understand it and *silently ignores ir*.  Instead, use
-    # the help output to see if "json+" exists at all...
+    # repo doesn't understand it and *silently ignores ir*.  The exceedance
+    # code needs the nanosecond clat_ns bins that json+ has had since 2.99,
+    # so decide from the version instead of running fio --help to look.
     try:
-        code, out, err = Run([fio, '--help'])
-        if (code == 0) and ("json+" in out):
+        if (int(vernums[0]), int(vernums[1])) >= (2, 99):
             fioOutputFormat = "json+"
     except:
         pass
@@ -126,21 +171,20 @@ def CheckAIOLimits():
     # If anything fails, silently continue.  FIO will give error if it
     # can't run due to the AIO setting later on.
     try:
-        code, out, err = Run(['cat', '/proc/sys/fs/aio-max-nr'])
-        if code == 0:
-            aiomaxnr = int(out.split("\n")[0].rstrip())
-            if aiomaxnr < int(aioNeeded):
-                sys.stderr.write(
-                    "ERROR: The kernel's maximum outstanding async IO" +
-                    "setting (aio-max-nr) is too\n")
-                sys.stderr.write("       low to complete the test run.  Required value is " + str(
-                    aioNeeded) + ", current is " + str(aiomaxnr) + "\n")
-                sys.stderr.write(
-                    "       To fix this temporarially, please execute the following command:\n")
-                sys.stderr.write(
-                    "            sudo sysctl -w fs.aio-max-nr=" + str(aioNeeded) + "\n")
-                sys.stderr.write("Unable to continue.  Exiting.\n")
-                sys.exit(2)
+        with open('/proc/sys/fs/aio-max-nr', 'r') as f:
+            aiomaxnr = int(f.readline().rstrip())
+        if aiomaxnr < int(aioNeeded):
+            sys.stderr.write(
+                "ERROR: The kernel's maximum outstanding async IO" +
+                "setting (aio-max-nr) is too\n")
+            sys.stderr.write("       low to complete the test run.  Required value is " + str(
+                aioNeeded) + ", current is " + str(aiomaxnr) + "\n")
+            sys.stderr.write(
+                "       To fix this temporarially, please execute the following command:\n")
+            sys.stderr.write(
+                "            sudo sysctl -w fs.aio-max-nr=" + str(aioNeeded) + "\n")
+            sys.stderr.write("Unable to continue.  Exiting.\n")
+            sys.exit(2)
     except:
         pass
 
@@ -229,27 +273,41 @@ WARNING: All data on the target device will be DESTROYED by this test.""")
         parser.print_help()
         sys.exit(1)
     # Sanity check that the selected drive is not mounted by parsing mounts
-    # This is not guaranteed to catch all as there's just too many different
-    # naming conventions out there.  Let's cover simple HDD/SSD/NVME patterns
-    pdispart = (re.match('.*p?[1-9][0-9]*$', physDrive) and
-                not re.match('.*/nvme[0-9]+n[1-9][0-9]*$', physDrive))
-    hit = ""
+    # For block devices compare device numbers, which works for any naming
+    # scheme.  Otherwise fall back to matching names, which is not
+    # guaranteed to catch all as there's just too many different naming
+    # conventions out there.  Let's cover simple HDD/SSD/NVME patterns
+    drivedev = BlockDevNumbers(physDrive)
+    pdispart = partRE.match(physDrive) and not nvmeRE.match(physDrive)
+    # Index mounts by device, a device mounted in several places only
+    # needs to be looked at once
+    mounts = {}
     with open("/proc/mounts", "r") as f:
-        mounts = f.readlines()
-    for l in mounts:
-        dev = l.split()[0]
-        mnt = l.split()[1]
-        if dev == physDrive:
-            hit = dev + " on " + mnt  # Obvious exact match
+        for l in f:
+            fields = l.split()
+            mounts.setdefault(fields[0], fields[1])
+    hit = ""
+    if not drivedev and physDrive in mounts:
+        hit = physDrive + " on " + mounts[physDrive]  # Obvious exact match
+    for dev, mnt in mounts.items():
+        if hit != "":
+            break
+        if drivedev:
+            # Either the device itself or a partition on it is mounted
+            if dev.startswith("/dev/"):
+                mntdev = BlockDevNumbers(dev)
+                if mntdev and drivedev[0] in mntdev:
+                    hit = dev + " on " + mnt
+            continue
         if pdispart:
             chkdev = dev
         else:
             # /dev/sdp# is special case, don't remove the "p"
-            if re.match('^/dev/sdp.*$', dev):
-                chkdev = re.sub('[1-9][0-9]*$', '', dev)
+            if sdpRE.match(dev):
+                chkdev = trailNumRE.sub('', dev)
             else:
                 # Need to see if mounted partition is on a raw device being tested
-                chkdev = re.sub('p?[1-9][0-9]*$', '', dev)
+                chkdev = partNumRE.sub('', dev)
         if chkdev == physDrive:
             hit = dev + " on " + mnt
     if hit != "":
@@ -258,21 +316,49 @@ WARNING: All data on the target device will be DESTROYED by this test.""")
         sys.exit(2)
 
 
+def BlockDevNumbers(dev):
+    """Return (st_rdev, whole disk st_rdev) of a block device, or None."""
+    try:
+        st = os.stat(dev)
+    except OSError:
+        return None
+    if not stat.S_ISBLK(st.st_mode):
+        return None
+    # Partitions show up in sysfs as a subdirectory of their disk
+    sysfs = os.path.realpath("/sys/dev/block/%d:%d" % (os.major(st.st_rdev),
+                                                       os.minor(st.st_rdev)))
+    try:
+        if os.path.exists(sysfs + "/partition"):
+            with open(os.path.dirname(sysfs) + "/dev", "r") as f:
+                major, minor = f.read().strip().split(":")
+            return st.st_rdev, os.makedev(int(major), int(minor))
+    except (OSError, ValueError):
+        pass
+    return st.st_rdev, st.st_rdev
+
+
 def grep(inlist, regex):
-    """Implement grep in a non-Pythonic way to make it comprehensible to humans"""
-    out = []
-    for i in inlist:
-        if re.search(regex, i):
-            out = out + [i]
-    return out
+    """Implement grep, return the entries of inlist that match the regex"""
+    pattern = re.compile(regex)
+    return [i for i in inlist if pattern.search(i)]
+
+
+def ParseCPUInfo(cpuinfo):
+    """Split /proc/cpuinfo lines into a dict of field name -> list of values"""
+    fields = {}
+    for line in cpuinfo:
+        key, sep, val = line.partition(':')
+        if sep:
+            fields.setdefault(key.strip(), []).append(val.strip())
+    return fields
 
 
 def CollectSystemInfo():
     """Collect some OS and CPU information."""
     global cpu, cpuCores, cpuFreqMHz, uname
     uname = " ".join(platform.uname())
-    code, cpuinfo, err = Run(['cat', '/proc/cpuinfo'])
-    cpuinfo = cpuinfo.split("\n")
+    with open('/proc/cpuinfo', 'r') as f:
+        cpuinfo = f.read().split("\n")
     if 'aarch64' in uname:
         code, cpuinfo, err = Run(['lscpu'])
         cpuinfo = cpuinfo.split("\n")
@@ -284,23 +370,24 @@ def CollectSystemInfo():
         except:
             cpuFreqMHz = grep(cpuinfo, r'max')[0].split(':')[1].lstrip()
     elif 'ppc64' in uname:
-        # Implement grep and sed in Python...
-        cpu = grep(cpuinfo, r'model')[0].split(': ')[1].replace('(R)', '').replace('(TM)', '')
-        cpuCores = len(grep(cpuinfo, r'processor'))
+        fields = ParseCPUInfo(cpuinfo)
+        cpu = fields['model'][0].replace('(R)', '').replace('(TM)', '')
+        cpuCores = len(fields['processor'])
         try:
             code, dmidecode, err = Run(['dmidecode', '--type', 'processor'])
             cpuFreqMHz = int(round(float(grep(dmidecode.split("\n"), r'Current Speed')[0].rstrip().lstrip().split(" ")[2])))
         except:
-            cpuFreqMHz = int(round(float(grep(cpuinfo, r'clock')[0].split(': ')[1][:-3])))
+            cpuFreqMHz = int(round(float(fields['clock'][0][:-3])))
     else:
-        model_names = grep(cpuinfo, r'model name')
-        cpu = model_names[0].split(': ')[1].replace('(R)', '').replace('(TM)', '')
+        fields = ParseCPUInfo(cpuinfo)
+        model_names = fields['model name']
+        cpu = model_names[0].replace('(R)', '').replace('(TM)', '')
         cpuCores = len(model_names)
         try:
             code, dmidecode, err = Run(['dmidecode', '--type', 'processor'])
             cpuFreqMHz = int(round(float(grep(dmidecode.split("\n"), r'Current Speed')[0].rstrip().lstrip().split(" ")[2])))
         except:
-            cpuFreqMHz = int(round(float(grep(cpuinfo, r'cpu MHz')[0].split(': ')[1])))
+            cpuFreqMHz = int(round(float(fields['cpu MHz'][0])))
 
 
 def VerifyContinue():
@@ -321,8 +408,19 @@ def CollectDriveInfo():
     """Get important device information, exit if not possible."""
     global physDriveGiB, physDriveGB, physDriveBase, testcapacity, testoffset
     global model, serial, physDrive, isFile
-    # We absolutely need this information
     pd = physDrive.split(',')[0]
+    # The identification probes are independent of each other and of the
+    # size lookup, so get them all running at once instead of one by one
+    try:
+        nvmeproc = RunStart(['nvme', 'list', '--output-format=json'])
+    except:
+        nvmeproc = None
+    try:
+        sdparmproc = RunStart(['sdparm', '--page', 'sn', '--inquiry',
+                               '--long', pd])
+    except:
+        sdparmproc = None
+    # We absolutely need this information
     try:
         if isFile:
             physDriveBase = os.path.basename(pd)
@@ -344,21 +442,25 @@ def CollectDriveInfo():
     # These are nice to have, but we can run without it
     model = "UNKNOWN"
     serial = "UNKNOWN"
+    found = False
     try:
-        nvmeclicmd = ['nvme', 'list', '--output-format=json']
-        code, nvmecli, err = Run(nvmeclicmd)
+        code, nvmecli, err = RunWait(nvmeproc)
         if code == 0:
             j = json.loads(nvmecli)
             for drive in j['Devices']:
                 if drive['DevicePath'] == pd:
                     model = drive['ModelNumber']
                     serial = drive['SerialNumber']
-                    return
+                    found = True
+                    break
     except:
         pass  # An error in nvme is not a problem
+    if found:
+        if sdparmproc is not None:
+            RunWait(sdparmproc, False)  # Not needed after all, but still reap it
+        return
     try:
-        sdparmcmd = ['sdparm', '--page', 'sn', '--inquiry', '--long', pd]
-        code, sdparm, err = Run(sdparmcmd)
+        code, sdparm, err = RunWait(sdparmproc)
         lines = sdparm.split("\n")
         if len(lines) == 4:
             model = re.sub(
@@ -370,8 +472,8 @@ def CollectDriveInfo():
         print("Install sdparm to allow model/serial extraction. Continuing.")
 
 
-def CSVInfoHeader(f):
-    """Headers to the CSV file (ending up in the ODS at the test end)."""
+def CSVInfoHeader():
+    """Header lines for the CSV files (ending up in the ODS at the test end)."""
     global physDriveTxt, model, serial, physDriveGiB, testcapacity, testoffset
     global cpu, cpuCores, cpuFreqMHz, uname, quickie, fastPrecond
     if quickie:
@@ -380,20 +482,20 @@ def CSVInfoHeader(f):
         prefix = ""
     if fastPrecond:
         prefix = "FASTPRECOND-" + prefix
-    AppendFile("Drive," + prefix + str(physDriveTxt).replace(",", " "), f)
-    AppendFile("Model," + prefix + str(model), f)
-    AppendFile("Serial," + prefix + str(serial), f)
-    AppendFile("AvailCapacity," + prefix + str(physDriveGiB) + ",GiB", f)
     if offset == 0:
         testcap = str(testcapacity)
     else:
         testcap = str(testcapacity) + " @ " + str(testoffset)
-    AppendFile("TestedCapacity," + prefix + str(testcap) + ",GiB", f)
-    AppendFile("CPU," + prefix + str(cpu), f)
-    AppendFile("Cores," + prefix + str(cpuCores), f)
-    AppendFile("Frequency," + prefix + str(cpuFreqMHz), f)
-    AppendFile("OS," + prefix + str(uname), f)
-    AppendFile("FIOVersion," + prefix + str(fioVerString), f)
+    return ["Drive," + prefix + str(physDriveTxt).replace(",", " "),
+            "Model," + prefix + str(model),
+            "Serial," + prefix + str(serial),
+            "AvailCapacity," + prefix + str(physDriveGiB) + ",GiB",
+            "TestedCapacity," + prefix + str(testcap) + ",GiB",
+            "CPU," + prefix + str(cpu),
+            "Cores," + prefix + str(cpuCores),
+            "Frequency," + prefix + str(cpuFreqMHz),
+            "OS," + prefix + str(uname),
+            "FIOVersion," + prefix + str(fioVerString)]
 
 
 def SetupFiles():
@@ -425,27 +527,26 @@ def SetupFiles():
     testcsv = details + "/ezfio_tests_"+suffix+".csv"
     if os.path.exists(testcsv):
         os.unlink(testcsv)
-    CSVInfoHeader(testcsv)
-    AppendFile("Type,Write %,Block Size,Threads,Queue Depth/Thread,IOPS," +
-               "Bandwidth (MB/s),Read Latency (us),Write Latency (us)," +
-               "System CPU,User CPU", testcsv)
+    # Each CSV gets its info header and column header in a single write
+    header = CSVInfoHeader()
+    AppendLines(header +
+                ["Type,Write %,Block Size,Threads,Queue Depth/Thread,IOPS," +
+                 "Bandwidth (MB/s),Read Latency (us),Write Latency (us)," +
+                 "System CPU,User CPU"], testcsv)
     timeseriescsv = details + "/ezfio_timeseries_"+suffix+".csv"
     timeseriesclatcsv = details + "/ezfio_timeseriesclat_"+suffix+".csv"
     timeseriesslatcsv = details + "/ezfio_timeseriesslat_"+suffix+".csv"
     for f in [timeseriescsv, timeseriesclatcsv, timeseriesslatcsv]:
         if os.path.exists(f):
             os.unlink(f)
-        CSVInfoHeader(f)
-    AppendFile(",".join(["IOPS"] + list(physDriveDict.keys())),
-               timeseriescsv)  # Add IOPS header
-    hdr = ""
-    for host in physDriveDict.keys():
-        hdr = hdr + ',' + host + "-read"
-        hdr = hdr + ',' + host + "-write"
-    AppendFile('CLAT-read,CLAT-write' + hdr,
-               timeseriesclatcsv)  # Add IOPS header
-    AppendFile('SLAT-read,SLAT-write' + hdr,
-               timeseriesslatcsv)  # Add IOPS header
+    AppendLines(header + [",".join(["IOPS"] + list(physDriveDict.keys()))],
+                timeseriescsv)  # Add IOPS header
+    hdr = "".join("," + host + "-read," + host + "-write"
+                  for host in physDriveDict.keys())
+    AppendLines(header + ['CLAT-read,CLAT-write' + hdr],
+                timeseriesclatcsv)  # Add IOPS header
+    AppendLines(header + ['SLAT-read,SLAT-write' + hdr],
+                timeseriesslatcsv)  # Add IOPS header
 
     # ODS input and output files
     odssrc = os.path.dirname(os.path.realpath(__file__)) + "/original.ods"
@@ -475,6 +576,25 @@ class FIOError(Exception):
         self.stdout = stdout
 
 
+def WriteJobfile(job):
+    """Write the lines of a FIO jobfile to a temp file, return the closed file.
+
+    The text written is kept in the returned object's .text so callers can
+    log it without reading the file back.
+    """
+    jobfile = tempfile.NamedTemporaryFile(delete=False, mode='w', dir=jobfileDir)
+    jobfile.text = "".join(job)
+    jobfile.write(jobfile.text)
+    jobfile.close()
+    return jobfile
+
+
+def HostMap(func, items):
+    """Apply func to each cluster item on a small thread pool, keep order."""
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        return list(ex.map(func, items))
+
+
 def TestName(seqrand, wmix, bs, threads, iodepth):
     """Return full path and filename prefix for test of specified params"""
     global details, physDriveBase
@@ -490,57 +610,55 @@ def SequentialConditioning():
 
     def GenerateJobfile(drive, testcapacity, testoffset):
         """Write the sequential jobfile for a single server"""
-        jobfile = tempfile.NamedTemporaryFile(delete=False, mode='w')
+        job = []
         for dr in drive.split(','):
-            jobfile.write("[SeqCond-" + dr + "]\n")
+            job.append("[SeqCond-" + dr + "]\n")
             # Note that we can't use regular test runner because this test needs
             # to run for a specified # of bytes, not a specified # of seconds.
-            jobfile.write("readwrite=write\n")
-            jobfile.write("bs=128k\n")
+            job.append("readwrite=write\n")
+            job.append("bs=128k\n")
             if nullio:
-                jobfile.write("ioengine=null\n")
+                job.append("ioengine=null\n")
             else:
-                jobfile.write("ioengine=libaio\n")
-            jobfile.write("iodepth=64\n")
-            jobfile.write("direct=1\n")
-            jobfile.write("filename=" + str(dr) + "\n")
+                job.append("ioengine=libaio\n")
+            job.append("iodepth=64\n")
+            job.append("direct=1\n")
+            job.append("filename=" + str(dr) + "\n")
             if quickie:
-                jobfile.write("size=1G\n")
+                job.append("size=1G\n")
             else:
-                jobfile.write("size=" + str(testcapacity) + "G\n")
-            jobfile.write("thread=1\n")
-            jobfile.write("offset=" + str(testoffset) + "G\n")
+                job.append("size=" + str(testcapacity) + "G\n")
+            job.append("thread=1\n")
+            job.append("offset=" + str(testoffset) + "G\n")
             if compressPct != 100:
-                jobfile.write("buffer_compress_percentage=" + str(compressPct) + "\n")
-        jobfile.close()
-        return jobfile
+                job.append("buffer_compress_percentage=" + str(compressPct) + "\n")
+        return WriteJobfile(job)
 
     cmdline = [fio]
     if not cluster:
         jobfile = GenerateJobfile(physDrive, testcapacity, testoffset)
         cmdline = cmdline + [jobfile.name]
     else:
-        jobfile = []
-        for host in physDriveDict.keys():
-            newjob = GenerateJobfile(
-                physDriveDict[host], testcapacity, testoffset)
-            cmdline = cmdline + ['--client=' + str(host), str(newjob.name)]
-            jobfile = jobfile + [newjob]
+        jobfile = HostMap(lambda host: GenerateJobfile(
+            physDriveDict[host], testcapacity, testoffset), physDriveDict.keys())
+        for host, newjob in zip(physDriveDict.keys(), jobfile):
+            cmdline.extend(['--client=' + str(host), str(newjob.name)])
     cmdline = cmdline + ['--output-format=' + str(fioOutputFormat)]
 
+    # The (possibly multi-MB) report is only looked at if FIO fails
     if not readOnly:
-        code, out, err = Run(cmdline)
+        code, out, err = Run(cmdline, False)
     else:
         code = 0
 
     if cluster:
-        for job in jobfile:
-            os.unlink(job.name)
+        HostMap(lambda job: os.unlink(job.name), jobfile)
     else:
         os.unlink(jobfile.name)
 
     if code != 0:
-        raise FIOError(" ".join(cmdline), code, err, out)
+        raise FIOError(" ".join(cmdline), code, err.decode('UTF-8'),
+                       out.decode('UTF-8'))
     else:
         return "DONE", "DONE", "DONE"
 
@@ -551,84 +669,102 @@ def RandomConditioning():
 
     def GenerateJobfile(drive, testcapacity, testoffset):
         """Write the random jobfile"""
-        jobfile = tempfile.NamedTemporaryFile(delete=False, mode='w')
+        job = []
         for dr in drive.split(','):
-            jobfile.write("[RandCond-" + dr + "]\n")
+            job.append("[RandCond-" + dr + "]\n")
             # Note that we can't use regular test runner because this test needs
             # to run for a specified # of bytes, not a specified # of seconds.
-            jobfile.write("readwrite=randwrite\n")
-            jobfile.write("bs=4k\n")
-            jobfile.write("invalidate=1\n")
-            jobfile.write("end_fsync=0\n")
-            jobfile.write("group_reporting=1\n")
-            jobfile.write("direct=1\n")
-            jobfile.write("filename=" + str(dr) + "\n")
+            job.append("readwrite=randwrite\n")
+            job.append("bs=4k\n")
+            job.append("invalidate=1\n")
+            job.append("end_fsync=0\n")
+            job.append("group_reporting=1\n")
+            job.append("direct=1\n")
+            job.append("filename=" + str(dr) + "\n")
             if quickie:
-                jobfile.write("size=1G\n")
+                job.append("size=1G\n")
             else:
-                jobfile.write("size=" + str(testcapacity) + "G\n")
+                job.append("size=" + str(testcapacity) + "G\n")
             if nullio:
-                jobfile.write("ioengine=null\n")
+                job.append("ioengine=null\n")
             else:
-                jobfile.write("ioengine=libaio\n")
-            jobfile.write("iodepth=256\n")
-            jobfile.write("norandommap\n")
-            jobfile.write("randrepeat=0\n")
-            jobfile.write("thread=1\n")
-            jobfile.write("offset=" + str(testoffset) + "G\n")
+                job.append("ioengine=libaio\n")
+            job.append("iodepth=256\n")
+            job.append("norandommap\n")
+            job.append("randrepeat=0\n")
+            job.append("thread=1\n")
+            job.append("offset=" + str(testoffset) + "G\n")
             if compressPct != 100:
-                jobfile.write("buffer_compress_percentage=" + str(compressPct) + "\n")
-        jobfile.close()
-        return jobfile
+                job.append("buffer_compress_percentage=" + str(compressPct) + "\n")
+        return WriteJobfile(job)
 
     cmdline = [fio]
     if not cluster:
         jobfile = GenerateJobfile(physDrive, testcapacity, testoffset)
         cmdline = cmdline + [jobfile.name]
     else:
-        jobfile = []
-        for host in physDriveDict.keys():
-            newjob = GenerateJobfile(
-                physDriveDict[host], testcapacity, testoffset)
-            cmdline = cmdline + ['--client=' + str(host), str(newjob.name)]
-            jobfile = jobfile + [newjob]
+        jobfile = HostMap(lambda host: GenerateJobfile(
+            physDriveDict[host], testcapacity, testoffset), physDriveDict.keys())
+        for host, newjob in zip(physDriveDict.keys(), jobfile):
+            cmdline.extend(['--client=' + str(host), str(newjob.name)])
     cmdline = cmdline + ['--output-format=' + str(fioOutputFormat)]
 
+    # The (possibly multi-MB) report is only looked at if FIO fails
     if not readOnly:
-        code, out, err = Run(cmdline)
+        code, out, err = Run(cmdline, False)
     else:
         code = 0
 
     if cluster:
-        for job in jobfile:
-            os.unlink(job.name)
+        HostMap(lambda job: os.unlink(job.name), jobfile)
     else:
         os.unlink(jobfile.name)
 
     if code != 0:
-        raise FIOError(" ".join(cmdline), code, err, out)
+        raise FIOError(" ".join(cmdline), code, err.decode('UTF-8'),
+                       out.decode('UTF-8'))
     else:
         return "DONE", "DONE", "DONE"
 
 
+def ExpandLogSamples(lines, seconds):
+    """Turn FIO log lines into per-second read and write value lists"""
+    rdseries = []
+    wrseries = []
+    # Set time 0 IOPS to first values
+    riops = 0
+    wiops = 0
+    nexttime = 0
+    # Walk the lines with a cursor, the piece after the final newline is
+    # never parsed
+    i = 0
+    last = len(lines) - 1
+    for x in range(0, seconds):
+        rdseries.append(riops)
+        wrseries.append(wiops)
+        while i < last and (nexttime < x):
+            # Only time, value, and direction are needed, ignore the rest
+            msec, val, ddir = lines[i].split(",", 3)[:3]
+            nexttime = float(msec) / 1000.0
+            if int(ddir) == 1:
+                wiops = int(val)
+            else:
+                riops = int(val)
+            i = i + 1
+    return rdseries, wrseries
+
+
+def ExpandLogFile(filename, seconds):
+    """Read a FIO log file and expand it with ExpandLogSamples()"""
+    with open(filename, 'r') as f:
+        lines = f.read().split("\n")
+    # Expand the irregular samples onto a per-second grid
+    return ExpandLogSamples(lines, seconds)
+
+
 def RunTest(iops_log, seqrand, wmix, bs, threads, iodepth, runtime):
     """Runs the specified test, generates output CSV lines."""
-    global cluster, physDriveDict, compressPct
-
-    # Taken from fio_latency2csv.py - needed to convert funky semi-log to normal latencies
-    def plat_idx_to_val(idx, FIO_IO_U_PLAT_BITS=6, FIO_IO_U_PLAT_VAL=64):
-        """Convert from lat bucket to real value, for obsolete FIO revisions"""
-        # MSB <= (FIO_IO_U_PLAT_BITS-1), cannot be rounded off. Use
-        # all bits of the sample as index
-        if idx < (FIO_IO_U_PLAT_VAL << 1):
-            return idx
-        # Find the group and compute the minimum value of that group
-        error_bits = (idx >> FIO_IO_U_PLAT_BITS) - 1
-        base = 1 << (error_bits + FIO_IO_U_PLAT_BITS)
-        # Find its bucket number of the group
-        k = idx % FIO_IO_U_PLAT_VAL
-        # Return the mean of the range of the bucket
-        return base + ((k + 0.5) * (1 << error_bits))
+    global cluster, physDriveDict, compressPct, pbszCache
 
     def WriteExceedance(j, rdwr, outfile):
         """Generate an exceedance CSV for read or write from JSON output."""
@@ -636,165 +772,159 @@ def RunTest(iops_log, seqrand, wmix, bs, threads, iodepth, runtime):
         if fioOutputFormat == "json":
             return  # This data not present in JSON format, only JSON+
         # Generate a dict of combined bins, either for jobs[0] or client_stats[]
-        bins = {}
+        # JSON dict has keys of type string, convert to integers as we go
+        # Bins are added straight into the Counter, no per-client temp dicts
+        bins = Counter()
         ios = 0
-        try:
+        if 'jobs' in j:
             # Non-cluster case will have jobs, only a single one needed
-            ios = j['jobs'][0][rdwr]['total_ios']
-            if ('N' in j['jobs'][0][rdwr]['clat_ns']) and (j['jobs'][0][rdwr]['clat_ns']['N'] > 0): 
-                bins = j['jobs'][0][rdwr]['clat_ns']['bins']
-            else:
-                bins = {}
-        except:
+            side = j['jobs'][0][rdwr]
+            ios = side['total_ios']
+            if side['clat_ns'].get('N', 0) > 0:
+                for k, v in side['clat_ns']['bins'].items():
+                    bins[int(k)] += v
+        else:
             # Cluster case will have client_stats to combine
             for client_stats in j['client_stats']:
                 if client_stats['jobname'] == 'All clients':
                     # Don't bother looking at combined, bins doesn't exist there
                     continue
-                if client_stats[rdwr]['total_ios']:
-                    ios = ios + client_stats[rdwr]['total_ios']
-                    for k in client_stats[rdwr]['clat_ns']['bins'].keys():
-                        try:
-                            bins[k] = bins[k] + client_stats[rdwr]['clat_ns']['bins'][k]
-                        except:
-                            bins[k] = client_stats[rdwr]['clat_ns']['bins'][k]
+                side = client_stats[rdwr]
+                if side['total_ios']:
+                    ios = ios + side['total_ios']
+                    for k, v in side['clat_ns']['bins'].items():
+                        bins[int(k)] += v
         #ios = client[rdwr]['total_ios']
         #bins = client[rdwr]['clat_ns']['bins']
         if ios:
-            runttl = 0
-            # This was changed in 2.99 to be in nanoseconds and to discard the crazy _bits magic
-            if float(fioVerString.split('-')[1]) >= 2.99:
-                lat_ns = []
-                # JSON dict has keys of type string, need a sorted integer list for our work...
-                for entry in bins:
-                    lat_ns.append(int(entry))
-                for entry in sorted(lat_ns):
-                    lat_us = float(entry) / 1000.0
-                    cnt = int(bins[str(entry)])
-                    runttl += cnt
-                    pctile = 1.0 - float(runttl) / float(ios)
-                    if cnt > 0:
-                        AppendFile(
-                            ",".join((str(lat_us), str(pctile))), outfile)
-            else:
-                plat_bits = client[rdwr]['clat']['bins']['FIO_IO_U_PLAT_BITS']
-                plat_val = client[rdwr]['clat']['bins']['FIO_IO_U_PLAT_VAL']
-                for b in range(0, int(client[rdwr]['clat']['bins']['FIO_IO_U_PLAT_NR'])):
-                    cnt = int(client[rdwr]['clat']['bins'][str(b)])
-                    runttl += cnt
-                    pctile = 1.0 - float(runttl) / float(ios)
-                    if cnt > 0:
-                        AppendFile(
-                            ",".join((str(plat_idx_to_val(b, plat_bits, plat_val)),
-                                      str(pctile))), outfile)
+            # json+ is only selected for FIO 2.99+, where bins are keyed in
+            # nanoseconds (older _bits bucket layouts never get here)
+            lat_ns = sorted(bins)
+            cnts = [int(bins[entry]) for entry in lat_ns]
+            # Running totals give the exceedance, only emit populated bins
+            ios = float(ios)
+            rows = []
+            for entry, cnt, runttl in zip(lat_ns, cnts, accumulate(cnts)):
+                if cnt > 0:
+                    pctile = 1.0 - float(runttl) / ios
+                    rows.append(str(float(entry) / 1000.0) + "," + str(pctile))
+            AppendLines(rows, outfile)
 
     def GenerateJobfile(rw, wmix, bs, drive, testcapacity, runtime, threads, iodepth, testoffset):
         """Make a jobfile for the specified test parameters"""
         global verify, nullio
-        jobfile = tempfile.NamedTemporaryFile(delete=False, mode='w')
+        job = []
         for dr in drive.split(","):
-            jobfile.write("[test-" + dr + "]\n")
-            jobfile.write("readwrite=" + str(rw) + "\n")
-            jobfile.write("rwmixwrite=" + str(wmix) + "\n")
-            jobfile.write("bs=" + str(bs) + "\n")
-            jobfile.write("invalidate=1\n")
-            jobfile.write("end_fsync=0\n")
-            jobfile.write("group_reporting=1\n")
-            jobfile.write("direct=1\n")
-            jobfile.write("filename=" + str(dr) + "\n")
-            jobfile.write("size=" + str(testcapacity) + "G\n")
-            jobfile.write("time_based=1\n")
-            jobfile.write("runtime=" + str(runtime) + "\n")
+            job.append("[test-" + dr + "]\n")
+            job.append("readwrite=" + str(rw) + "\n")
+            job.append("rwmixwrite=" + str(wmix) + "\n")
+            job.append("bs=" + str(bs) + "\n")
+            job.append("invalidate=1\n")
+            job.append("end_fsync=0\n")
+            job.append("group_reporting=1\n")
+            job.append("direct=1\n")
+            job.append("filename=" + str(dr) + "\n")
+            job.append("size=" + str(testcapacity) + "G\n")
+            job.append("time_based=1\n")
+            job.append("runtime=" + str(runtime) + "\n")
             if nullio:
-                jobfile.write("ioengine=null\n")
+                job.append("ioengine=null\n")
             else:
-                jobfile.write("ioengine=libaio\n")
-            jobfile.write("numjobs=" + str(threads) + "\n")
-            jobfile.write("iodepth=" + str(iodepth) + "\n")
-            jobfile.write("norandommap=1\n")
-            jobfile.write("randrepeat=0\n")
-            jobfile.write("thread=1\n")
-            jobfile.write("exitall=1\n")
+                job.append("ioengine=libaio\n")
+            job.append("numjobs=" + str(threads) + "\n")
+            job.append("iodepth=" + str(iodepth) + "\n")
+            job.append("norandommap=1\n")
+            job.append("randrepeat=0\n")
+            job.append("thread=1\n")
+            job.append("exitall=1\n")
             if verify:
-                jobfile.write("verify=crc32c\n")
-                jobfile.write("random_generator=lfsr\n")
-            jobfile.write("offset=" + str(testoffset) + "G\n")
+                job.append("verify=crc32c\n")
+                job.append("random_generator=lfsr\n")
+            job.append("offset=" + str(testoffset) + "G\n")
             if compressPct != 100:
-                jobfile.write("buffer_compress_percentage=" + str(compressPct) + "\n")
-        jobfile.close()
-        return jobfile
+                job.append("buffer_compress_percentage=" + str(compressPct) + "\n")
+        return WriteJobfile(job)
 
     def CombineThreadOutputs(suffix, outcsv, lat):
         """Merge all FIO iops/lat logs across all servers"""
-        # The lists may be called "iops" but the same works for clat/slat
-        iops = [0] * (runtime + extra_runtime)
-        # For latencies, need to keep the _w and _r separate
-        iops_w = [0] * (runtime + extra_runtime)
-        host_iops = OrderedDict()
-        host_iops_w = OrderedDict()
+        # The arrays may be called "iops" but the same works for clat/slat.
+        # Typed int64 arrays hold raw machine ints, not boxed Python objects.
+        # For latencies, need to keep the _w and _r separate.  One row per
+        # host, in pdd order, so hosts are addressed by index not by name
+        host_iops = []
+        host_iops_w = []
         filecnt = 0
         if not cluster:
-            pdd = OrderedDict()
+            pdd = {}
             pdd['localhost'] = 1 # Just the single host, faked here
         else:
             pdd = physDriveDict
+        # Scan the details directory once and bin the logs by host
+        hostfiles = {}
         for host in pdd.keys():
-            host_iops[host] = [0] * (runtime + extra_runtime)
-            host_iops_w[host] = [0] * (runtime + extra_runtime)
-            if not cluster:
-                fileglob = testfile + str(suffix) + '.*log'
-            else:
-                fileglob = testfile + str(suffix) + '.*.log.' + host
-            for filename in glob.glob(fileglob):
+            hostfiles[host] = []
+        if not cluster:
+            hostfiles['localhost'] = glob.glob(testfile + str(suffix) + '.*log')
+        else:
+            for filename in glob.glob(testfile + str(suffix) + '.*.log.*'):
+                # Match on the whole host name, which may itself contain dots
+                for host in pdd.keys():
+                    if filename.endswith('.log.' + str(host)):
+                        hostfiles[host].append(filename)
+        for host in pdd.keys():
+            rdrow = array('q', [0]) * (runtime + extra_runtime)
+            wrrow = array('q', [0]) * (runtime + extra_runtime)
+            for filename in hostfiles[host]:
                 filecnt = filecnt + 1
-                catcmdline = ['cat', filename]
-                catcode, catout, caterr = Run(catcmdline)
-                if catcode != 0:
+                try:
+                    rdseries, wrseries = ExpandLogFile(filename,
+                                                       runtime + extra_runtime)
+                except OSError:
                     AppendFile("ERROR", testcsv)
-                    raise FIOError(" ".join(catcmdline),
-                                   catcode, caterr, catout)
-                lines = catout.split("\n")
-                # Set time 0 IOPS to first values
-                riops = 0
-                wiops = 0
-                nexttime = 0
-                for x in range(0, runtime + extra_runtime):
-                    if not lat:
-                        iops[x] = iops[x] + riops + wiops
-                        host_iops[host][x] = host_iops[host][x] + riops + wiops
-                    else:
-                        iops[x] = iops[x] + riops
-                        iops_w[x] = iops_w[x] + wiops
-                        host_iops[host][x] = host_iops[host][x] + riops
-                        host_iops_w[host][x] = host_iops_w[host][x] + wiops
-                    while len(lines) > 1 and (nexttime < x):
-                        parts = lines[0].split(",")
-                        nexttime = float(parts[0]) / 1000.0
-                        if int(lines[0].split(",")[2]) == 1:
-                            wiops = int(parts[1])
-                        else:
-                            riops = int(parts[1])
-                        lines = lines[1:]
-
-        # Generate the combined CSV
-        with open(outcsv, 'a') as f:
-            for cnt in range(int(extra_runtime/2), runtime + extra_runtime):
-                if filecnt > 0 and lat:
-                    line = str(float(iops[cnt])/float(filecnt))
-                    line = line + ',' + str(float(iops_w[cnt])/float(filecnt))
+                    raise
+                # Fold the whole series into the host totals at once
+                if not lat:
+                    rdrow = array('q', map(add, rdrow,
+                                           map(add, rdseries, wrseries)))
                 else:
-                    line = str(iops[cnt])
-                if len(pdd.keys()) > 1:
-                    for host in pdd.keys():
-                        if filecnt > 0 and lat:
-                            line = line + ',' + \
-                                str(float(host_iops[host][cnt])/float(filecnt))
-                            line = line + ',' + \
-                                str(float(host_iops_w[host]
-                                          [cnt])/float(filecnt))
-                        else:
-                            line = line + "," + str(host_iops[host][cnt])
-                f.write(line + "\n")
+                    rdrow = array('q', map(add, rdrow, rdseries))
+                    wrrow = array('q', map(add, wrrow, wrseries))
+            host_iops.append(rdrow)
+            host_iops_w.append(wrrow)
+
+        # Overall totals are the sum across all hosts
+        iops = array('q', map(sum, zip(*host_iops)))
+        iops_w = array('q', map(sum, zip(*host_iops_w)))
+
+        # Latencies are averaged over all the threads, divide whole series
+        # up front so the output loop below only has to format them
+        average = filecnt > 0 and lat
+        if average:
+            div = float(filecnt)
+            iops = [v / div for v in iops]
+            iops_w = [v / div for v in iops_w]
+            host_iops = [[v / div for v in row] for row in host_iops]
+            host_iops_w = [[v / div for v in row] for row in host_iops_w]
+
+        # Generate the combined CSV, all rows go out in a single write
+        hosts = list(pdd.keys())
+        multihost = len(hosts) > 1
+        rows = []
+        for cnt in range(int(extra_runtime/2), runtime + extra_runtime):
+            # Gather the row's fields and join once, no growing string
+            if average:
+                fields = [iops[cnt], iops_w[cnt]]
+            else:
+                fields = [iops[cnt]]
+            if multihost:
+                for h in range(len(hosts)):
+                    if average:
+                        fields.append(host_iops[h][cnt])
+                        fields.append(host_iops_w[h][cnt])
+                    else:
+                        fields.append(host_iops[h][cnt])
+            rows.append(",".join(map(str, fields)))
+        AppendLines(rows, outcsv)
 
     # Output file names
     testfile = TestName(seqrand, wmix, bs, threads, iodepth)
@@ -814,42 +944,48 @@ def RunTest(iops_log, seqrand, wmix, bs, threads, iodepth, runtime):
         jobfile = GenerateJobfile(rw, wmix, bs, physDrive, testcapacity,
                                   runtime + extra_runtime, threads, iodepth, testoffset)
         cmdline = cmdline + [jobfile.name]
-        AppendFile("[JOBFILE]", testfile)
-        with open(jobfile.name, 'r') as of:
-            txt = of.read()
-            AppendFile(txt, testfile)
+        AppendLines(["[JOBFILE]", jobfile.text], testfile)
         if iops_log:
-            AppendFile("write_iops_log=" + testfile, jobfile.name)
-            AppendFile("write_lat_log=" + testfile, jobfile.name)
-            AppendFile("log_avg_msec=1000", jobfile.name)
-            AppendFile("log_unix_epoch=0", jobfile.name)
+            AppendLines(["write_iops_log=" + testfile,
+                         "write_lat_log=" + testfile,
+                         "log_avg_msec=1000",
+                         "log_unix_epoch=0"], jobfile.name)
     else:
-        jobfile = []
-        for host in physDriveDict.keys():
-            newjob = GenerateJobfile(rw, wmix, bs, physDriveDict[host], testcapacity,
-                                     runtime + extra_runtime, threads, iodepth, testoffset)
-            cmdline = cmdline + ['--client=' + str(host), str(newjob.name)]
-            AppendFile('[JOBFILE-' + str(host) + "]", testfile)
-            with open(newjob.name, 'r') as of:
-                txt = of.read()
-                AppendFile(txt, testfile)
-            jobfile = jobfile + [newjob]
+        jobfile = HostMap(lambda host: GenerateJobfile(
+            rw, wmix, bs, physDriveDict[host], testcapacity,
+            runtime + extra_runtime, threads, iodepth, testoffset),
+            physDriveDict.keys())
+        # Log every host's jobfile with a single append
+        jobtxt = []
+        for host, newjob in zip(physDriveDict.keys(), jobfile):
+            cmdline.extend(['--client=' + str(host), str(newjob.name)])
+            jobtxt.extend(['[JOBFILE-' + str(host) + "]", newjob.text])
             if iops_log:
-                AppendFile("write_iops_log=" + testfile, newjob.name)
-                AppendFile("write_lat_log=" + testfile, newjob.name)
-                AppendFile("log_avg_msec=1000", newjob.name)
-                AppendFile("log_unix_epoch=0", newjob.name)
+                AppendLines(["write_iops_log=" + testfile,
+                             "write_lat_log=" + testfile,
+                             "log_avg_msec=1000",
+                             "log_unix_epoch=0"], newjob.name)
+        AppendLines(jobtxt, testfile)
 
-    cmdline = cmdline + ['--output-format=' + str(fioOutputFormat)]
+    # Have FIO write its (possibly multi-MB) JSON report straight to disk
+    jsonfile = testfile + ".json"
+    cmdline = cmdline + ['--output-format=' + str(fioOutputFormat),
+                         '--output=' + jsonfile]
 
     # There are some NVME drives with 4k physical and logical out there.
     # Check that we can actually do this size IO, OTW return 0 for all
     skiptest = False
-    code, out, err = Run(['blockdev', '--getpbsz', str(physDrive.split(',')[0])])
-    if code == 0:
-        iomin = int(out.split("\n")[0])
-        if int(bs) < iomin:
-            skiptest = True
+    # The physical block size can't change between tests, only ask once
+    pbszdev = str(physDrive.split(',')[0])
+    if pbszdev not in pbszCache:
+        code, out, err = Run(['blockdev', '--getpbsz', pbszdev])
+        if code == 0:
+            pbszCache[pbszdev] = int(out.split("\n")[0])
+        else:
+            pbszCache[pbszdev] = 0
+    iomin = pbszCache[pbszdev]
+    if iomin and int(bs) < iomin:
+        skiptest = True
 
     if readOnly and wmix != 0:
         skiptest = True 
@@ -864,14 +1000,10 @@ def RunTest(iops_log, seqrand, wmix, bs, threads, iodepth, runtime):
         err = ""
     else:
         code, out, err = Run(cmdline)
-    AppendFile("[STDOUT]", testfile)
-    AppendFile(out, testfile)
-    AppendFile("[STDERR]", testfile)
-    AppendFile(err, testfile)
+    AppendLines(["[STDOUT]", out, "[STDERR]", err], testfile)
 
     if cluster:
-        for job in jobfile:
-            os.unlink(job.name)
+        HostMap(lambda job: os.unlink(job.name), jobfile)
     else:
         os.unlink(jobfile.name)
 
@@ -892,12 +1024,7 @@ def RunTest(iops_log, seqrand, wmix, bs, threads, iodepth, runtime):
     syscpu = 0
     usrcpu = 0
     if not skiptest:
-        # Chomp anything before the json.
-        for i in range(0, len(out)):
-            if out[i] == '{':
-                out = out[i:]
-                break
-        j = json.loads(out)
+        j = LoadFIOJSON(jsonfile)
 
         if cluster and len(physDriveDict.keys()) == 1:
             client = j['client_stats'][0]
@@ -912,27 +1039,28 @@ def RunTest(iops_log, seqrand, wmix, bs, threads, iodepth, runtime):
         syscpu = float(client['sys_cpu'])
         usrcpu = float(client['usr_cpu'])
 
-        rdiops = float(client['read']['iops'])
-        wriops = float(client['write']['iops'])
+        rd = client['read']
+        wr = client['write']
+        rdiops = float(rd['iops'])
+        wriops = float(wr['iops'])
 
         # 'lat' goes to 'lat_ns' in newest FIO JSON formats...ugh
-        try:
-            rlat = float(client['read']['lat_ns']['mean']) / 1000  # ns->us
-        except:
-            rlat = float(client['read']['lat']['mean'])
-        try:
-            wlat = float(client['write']['lat_ns']['mean']) / 1000  # ns->us
-        except:
-            wlat = float(client['write']['lat']['mean'])
+        # Check for the key instead of parsing and catching the failure
+        if 'lat_ns' in rd:
+            rlat = float(rd['lat_ns']['mean']) / 1000  # ns->us
+        else:
+            rlat = float(rd['lat']['mean'])
+        if 'lat_ns' in wr:
+            wlat = float(wr['lat_ns']['mean']) / 1000  # ns->us
+        else:
+            wlat = float(wr['lat']['mean'])
 
-    iops = "{0:0.0f}".format(rdiops + wriops)
-    mbps = "{0:0.2f}".format((float((rdiops+wriops) * bs) /
-                              (1024.0 * 1024.0)))
-    lat = "{0:0.1f}".format(max(rlat, wlat))
+    iops = f"{rdiops + wriops:0.0f}"
+    mbps = f"{float((rdiops + wriops) * bs) / (1024.0 * 1024.0):0.2f}"
+    lat = f"{max(rlat, wlat):0.1f}"
 
-    AppendFile(",".join((str(seqrand), str(wmix), str(bs), str(threads),
-                         str(iodepth), str(iops), str(mbps), str(rlat),
-                         str(wlat), str(syscpu), str(usrcpu))), testcsv)
+    AppendFile(f"{seqrand},{wmix},{bs},{threads},{iodepth},{iops},{mbps},"
+               f"{rlat},{wlat},{syscpu},{usrcpu}", testcsv)
 
     if skiptest:
         AppendFile("1,1\n", testfile + ".exc.read.csv")
@@ -1179,30 +1307,37 @@ def RunAllTests():
             else:
                 print(descfmt.format(o['desc']), end='')
             sys.stdout.flush()
-            starttime = datetime.datetime.now()
-            job = threading.Thread(target=JobWrapper, kwargs=(o))
-            job.start()
-            while job.is_alive():
-                now = datetime.datetime.now()
-                delta = now - starttime
-                dstr = "{0:02}:{1:02}:{2:02}".format(int(delta.seconds / 3600),
-                                                     int((delta.seconds % 3600)/60),
-                                                     int(delta.seconds % 60))
+            # Only the runtime changes while the job runs, format the
+            # description column once
+            descstr = descfmt.format(o['desc']) + " "
+            starttime = time.monotonic()
+            pool = ThreadPoolExecutor(max_workers=1)
+            job = pool.submit(JobWrapper, **o)
+            while not job.done():
+                secs = int(time.monotonic() - starttime)
+                dstr = "{0:02}:{1:02}:{2:02}".format(secs // 3600,
+                                                     (secs % 3600) // 60,
+                                                     secs % 60)
                 if sys.stdout.isatty():
                     # Blink runtime to make it obvious stuff is happening
-                    if (delta.seconds % 2) != 0:
-                        print(fmtstr.format(o['desc'], "Runtime", dstr, "..."), end='\r')
+                    if (secs % 2) != 0:
+                        print(descstr + resfmt.format("", "Runtime", dstr, "..."), end='\r')
                     else:
-                        print(fmtstr.format(o['desc'], "", dstr, ""), end='\r')
+                        print(descstr + resfmt.format("", "", dstr, ""), end='\r')
                 sys.stdout.flush()
-                time.sleep(1)
-            job.join()
+                # Wakes early as soon as the job completes
+                wait([job], timeout=1)
+            pool.shutdown()
+            err = job.exception()
+            if err is not None:
+                # Errors are flagged through ret_mbps below, just show it
+                traceback.print_exception(type(err), err, err.__traceback__)
             # Pretty-print with grouping, if possible
             try:
                 ret_iops = "{:,}".format(int(ret_iops))
                 ret_mbps = "{:0,.2f}".format(float(ret_mbps))
-            except:
-                pass
+            except (TypeError, ValueError):
+                pass  # "ERROR" or other non-numeric results print as-is
             if sys.stdout.isatty():
                 print(fmtstr.format(o['desc'], ret_mbps, ret_iops, ret_lat))
             else:
@@ -1217,118 +1352,190 @@ def RunAllTests():
 
 def GenerateResultODS():
     """Builds a new ODS spreadsheet w/graphs from generated test CSV files."""
+    # Only needed at the very end of a run, so don't pay for it at startup
+    import zipfile
 
     def GetContentXMLFromODS(odssrc):
         """Extract content.xml from an ODS file, where the sheet lives."""
-        ziparchive = zipfile.ZipFile(odssrc)
-        content = ziparchive.read("content.xml").decode('UTF-8')
-        content = content.replace("\n", "")
+        # Kept as UTF-8 bytes, it's written back out without a re-encode
+        with zipfile.ZipFile(odssrc) as ziparchive:
+            content = ziparchive.read("content.xml")
+        content = content.replace(b"\n", b"")
         return content
 
+    def XMLText(val):
+        """Escape a value for use as XML text, as UTF-8 bytes."""
+        return str(val).translate(xmlEscape).encode('UTF-8')
+
     def CSVtoXMLSheet(sheetName, csvName):
-        """Replace a named sheet with the contents of a CSV file."""
-        newt = '<table:table table:name='
-        newt += '"' + sheetName + '"' + ' table:style-name="ta1" > '
-        newt += '<table:table-column table:style-name="co1" '
-        newt += 'table:default-cell-style-name="Default"/>'
+        """Generate a named sheet with the contents of a CSV file, by row."""
+        # Nothing is read until the content.xml writer asks for it, and then
+        # only the CSV text and one XML row at a time are held in memory.
+        # Rows are produced as UTF-8 bytes, ready to go into the zip without
+        # another encode pass
+        yield odsSheetStart % sheetName.encode('UTF-8')
+        # Bind the per-cell helpers once, outside the cell loop
+        isnumber = numberRE.match
+        isnumrow = numRowRE.match
+        floatcell = odsFloatCell.__mod__
+        stringcell = odsStringCell.__mod__
+        # Slurp the CSV in one read and split it in C, far fewer calls than
+        # iterating the file object line by line
+        with open(csvName, 'rb') as f:
+            lines = f.read().splitlines()
         # Insert the rows, one entry at a time
-        with open(csvName, 'r') as f:
-            for line in f:
-                line = line.rstrip()
-                newt += '<table:table-row table:style-name="ro1">'
-                for val in line.split(','):
-                    try:
-                        cell = '<table:table-cell office:value-type="float" '
-                        cell += 'office:value="' + str(float(val))
-                        cell += '"><text:p>'
-                        cell += str(float(val)) + \
-                            '</text:p></table:table-cell>'
-                    except:  # It's not a float, so let's call it a string
-                        cell = '<table:table-cell office:value-type="string" '
-                        cell += '><text:p>'
-                        cell += str(val) + '</text:p></table:table-cell>'
-                    newt += cell
-                newt += '</table:table-row>'
-            f.close()
+        for line in lines:
+            line = line.rstrip()
+            # Most rows are all numbers (the timeseries and exceedance
+            # data), so one regex over the line skips per-cell matching
+            numrow = isnumrow(line)
+            cells = []
+            # Runs of identical cells (zeros, empty padding) become a single
+            # cell with a repeat count, so there is less XML to deflate
+            for val, run in groupby(line.split(b',')):
+                count = len(tuple(run))
+                repeat = odsRepeat % count if count > 1 else b''
+                # CSV numbers are already in canonical form and can't contain
+                # any XML specials, so use them as-is.  Anything else is a
+                # string, which may (drive model, uname) and needs escaping
+                if numrow or isnumber(val):
+                    cells.append(floatcell((repeat, val, val)))
+                else:
+                    cells.append(stringcell((repeat, val.decode('UTF-8').
+                                             translate(xmlEscape).
+                                             encode('UTF-8'))))
+            yield odsRowStart + b"".join(cells) + odsRowEnd
         # Close the tags
-        newt += '</table:table>'
-        return newt
+        yield b'</table:table>'
 
-    def ReplaceSheetWithCSV_regex(sheetName, csvName, xmltext):
-        """Replace a named sheet with the contents of a CSV file."""
-        newt = CSVtoXMLSheet(sheetName, csvName)
+    def ReplaceSheetWithCSV(sheetName, csvName, parts):
+        """Replace a named sheet with the contents of a CSV file.
 
-        # Replace the XML using lazy string matching
-        searchstr = '<table:table table:name="' + sheetName
-        searchstr += '".*?</table:table>'
-        return re.sub(searchstr, newt, xmltext, flags=re.DOTALL)
+        The document is a list of template bytes and sheet generators,
+        the new sheet is spliced in as a generator and not expanded here.
+        """
+        for i, xmltext in enumerate(parts):
+            if not isinstance(xmltext, bytes):
+                continue
+            # Find the sheet with plain string searches, no need to run a
+            # regex over the entire document just to locate a literal tag
+            start = xmltext.find(b'<table:table table:name="' +
+                                 sheetName.encode('UTF-8') + b'"')
+            if start < 0:
+                continue
+            endtag = b'</table:table>'
+            end = xmltext.find(endtag, start)
+            if end < 0:
+                continue
+            return (parts[:i] + [xmltext[:start],
+                                 CSVtoXMLSheet(sheetName, csvName),
+                                 xmltext[end + len(endtag):]] + parts[i + 1:])
+        return parts
 
-    def AppendSheetFromCSV(sheetName, csvName, xmltext):
+    def AppendSheetFromCSV(sheetName, csvName, parts):
         """Add a new sheet to the XML from the CSV file."""
-        newt = CSVtoXMLSheet(sheetName, csvName)
-
-        # Replace the XML using lazy string matching
-        searchstr = '<table:named-expressions/>'
-        return re.sub(searchstr, newt + searchstr, xmltext, flags=re.DOTALL)
-
-    def UpdateContentXMLToODS_text(odssrc, odsdest, xmltext):
-        """Replace content.xml in an ODS w/an in-memory copy and write new.
-
-        Replace content.xml in an ODS file with in-memory, modified copy and
-        write new ODS. Can't just copy source.zip and replace one file, the
-        output ZIP file is not correct in many cases (opens in Excel but fails
-        ODF validation and LibreOffice fails to load under Windows).
+        searchstr = b'<table:named-expressions/>'
+        for i, xmltext in enumerate(parts):
+            if isinstance(xmltext, bytes) and searchstr in xmltext:
+                before, sep, after = xmltext.partition(searchstr)
+                return (parts[:i] + [before,
+                                     CSVtoXMLSheet(sheetName, csvName),
+                                     sep + after] + parts[i + 1:])
+        return parts
+
+    def UpdateContentXMLToODS_text(odssrc, odsdest, parts):
+        """Replace content.xml in an ODS w/a generated copy and write new.
+
+        Replace content.xml in an ODS file with a modified copy, given as a
+        list of bytes and sheet row generators, and write new ODS. Can't just copy source.zip
+        and replace one file, the output ZIP file is not correct in many cases
+        (opens in Excel but fails ODF validation and LibreOffice fails to load
+        under Windows).
 
         Also strips out any binary versions of objects and the thumbnail,
         since they are no longer valid once we've changed the data in the
         sheet.
         """
-        if os.path.exists(odsdest):
-            os.unlink(odsdest)
-
-        # Windows ZipArchive will not use "Store" even with "no compression"
-        # so we need to have a mimetype.zip file encoded below to match spec:
-        mimetypezip = """
-UEsDBBQAAAgAAICyN0+FbDmKLgAAAC4AAAAIAAAAbWltZXR5cGVhcHBsaWNhdGlvbi92bmQub2Fz
-aXMub3BlbmRvY3VtZW50LnNwcmVhZHNoZWV0UEsBAhQAFAAACAAAgLI3T4VsOYouAAAALgAAAAgA
-AAAAAAAAAAAAAAAAAAAAAG1pbWV0eXBlUEsFBgAAAAABAAEANgAAAFQAAAAAAA==
-"""
-        zipbytes = base64.b64decode(mimetypezip)
-        with open(odsdest, 'wb') as f:
-            f.write(zipbytes)
-
-        zasrc = zipfile.ZipFile(odssrc, 'r')
-        zadst = zipfile.ZipFile(odsdest, 'a', zipfile.ZIP_DEFLATED)
-        for entry in zasrc.namelist():
-            if entry == "mimetype":
-                continue
-            elif entry.endswith('/') or entry.endswith('\\'):
-                continue
-            elif entry == "content.xml":
-                zadst.writestr("content.xml", xmltext)
-            elif ("Object" in entry) and ("content.xml" in entry):
-                # Remove <table:table table:name="local-table"> table
-                rdbytes = zasrc.read(entry).decode('UTF-8')
-                outbytes = re.sub(
-                    '<table:table table:name="local-table">.*</table:table>', "", rdbytes, flags=re.DOTALL)
-                zadst.writestr(entry, outbytes)
-            elif entry == "META-INF/manifest.xml":
-                # Remove ObjectReplacements from the list
-                rdbytes = zasrc.read(entry).decode('UTF-8')
-                outbytes = ""
-                lines = rdbytes.split("\n")
-                for line in lines:
-                    if not (("ObjectReplacement" in line) or ("Thumbnails" in line)):
-                        outbytes = outbytes + line + "\n"
-                zadst.writestr(entry, outbytes)
-            elif ("Thumbnails" in entry) or ("ObjectReplacement" in entry):
-                # Skip binary versions
-                continue
-            else:
-                rdbytes = zasrc.read(entry)
-                zadst.writestr(entry, rdbytes)
-        zasrc.close()
-        zadst.close()
+        def MemberType(size):
+            """Pick stored or deflated for a member by its uncompressed size."""
+            # Tiny members (per-chart meta.xml) save a few hundred bytes at
+            # most when deflated, so don't spin up a compressor for them
+            if size < odsStoreMax:
+                return zipfile.ZIP_STORED
+            return zipfile.ZIP_DEFLATED
+
+        # Sheets are read from their CSVs while the archive is written, so
+        # build it under a temporary name and only replace odsdest once it's
+        # complete.  A missing CSV mustn't leave a truncated ODS behind
+        tmpdest = odsdest + ".tmp"
+        try:
+            # Write the whole archive in a single pass.  The deflater hands
+            # back many small chunks, so gather them in a 1MB buffer and hit
+            # the filesystem with large writes instead.  The generated XML is
+            # the bulk of the work and the result is only opened once by a
+            # spreadsheet app, so favor compression speed
+            with zipfile.ZipFile(odssrc, 'r') as zasrc, \
+                    open(tmpdest, 'wb', buffering=1 << 20) as dstfile, \
+                    zipfile.ZipFile(dstfile, 'w', zipfile.ZIP_DEFLATED,
+                                    compresslevel=1) as zadst:
+                # The ODF spec requires "mimetype" be the first entry, uncompressed
+                mimetype = zipfile.ZipInfo("mimetype")
+                mimetype.compress_type = zipfile.ZIP_STORED
+                mimetype.create_system = 0  # FAT, as LibreOffice writes it
+                zadst.writestr(mimetype, odsMimetype)
+                for entry in zasrc.namelist():
+                    if entry == "mimetype":
+                        continue
+                    elif entry.endswith('/') or entry.endswith('\\'):
+                        continue
+                    elif entry == "content.xml":
+                        # Stream the sheets row by row, never the whole document.
+                        # Its size isn't known up front and a long sweep can pass
+                        # 2GB, so allow ZIP64 here.  Everything else is small and
+                        # gets plain headers
+                        with zadst.open("content.xml", 'w',
+                                        force_zip64=True) as dst:
+                            for part in parts:
+                                if isinstance(part, bytes):
+                                    dst.write(part)
+                                else:
+                                    # Sheets yield ready-to-write UTF-8 rows
+                                    dst.writelines(part)
+                    elif ("Object" in entry) and ("content.xml" in entry):
+                        # Remove <table:table table:name="local-table"> table, up to
+                        # the last closing tag, by position instead of a DOTALL regex
+                        outbytes = zasrc.read(entry)
+                        start = outbytes.find(b'<table:table table:name="local-table">')
+                        endtag = b'</table:table>'
+                        end = outbytes.rfind(endtag)
+                        if start >= 0 and end >= start:
+                            outbytes = outbytes[:start] + outbytes[end + len(endtag):]
+                        zadst.writestr(entry, outbytes,
+                                       compress_type=MemberType(len(outbytes)))
+                    elif entry == "META-INF/manifest.xml":
+                        # Remove ObjectReplacements from the list
+                        rdbytes = zasrc.read(entry)
+                        lines = rdbytes.split(b"\n")
+                        outbytes = b"".join(line + b"\n" for line in lines
+                                            if not ((b"ObjectReplacement" in line) or
+                                                    (b"Thumbnails" in line)))
+                        zadst.writestr(entry, outbytes,
+                                       compress_type=MemberType(len(outbytes)))
+                    elif ("Thumbnails" in entry) or ("ObjectReplacement" in entry):
+                        # Skip binary versions
+                        continue
+                    else:
+                        srcinfo = zasrc.getinfo(entry)
+                        info = zipfile.ZipInfo(entry, srcinfo.date_time)
+                        info.compress_type = MemberType(srcinfo.file_size)
+                        # A ZipInfo doesn't pick up the archive's compresslevel, so
+                        # pass it explicitly.  Template members are all a few KB
+                        zadst.writestr(info, zasrc.read(entry), compresslevel=1)
+        except BaseException:
+            if os.path.exists(tmpdest):
+                os.unlink(tmpdest)
+            raise
+        os.replace(tmpdest, odsdest)
 
     def CombineExceedanceCSV(qdList, testType, testWpct, testBS, testIOdepth, suffix):
         """Merge multiple exceedance CSVs into a single output file.
@@ -1339,75 +1546,64 @@ AAAAAAAAAAAAAAAAAAAAAG1pbWV0eXBlUEsFBgAAAAABAAEANgAAAFQAAAAAAA==
         csv = details + "/ezfio_exceedance_"+suffix+".csv"
         if os.path.exists(csv):
             os.unlink(csv)
-        CSVInfoHeader(csv)
-        line1 = ""
-        line2 = ""
+        # Two header rows, one 5-column group per QD
+        line1 = "".join("QD%d Read Exceedance,,QD%d Write Exceedance,,," %
+                        (qd, qd) for qd in qdList)
+        line2 = "rdusec,rdpct,wrusec,wrpct,," * len(qdList)
+        rows = CSVInfoHeader() + [line1, line2]
+
+        # Read each read/write CSV whole, missing ones are empty columns
+        cols = []
         for qd in qdList:
-            line1 = line1 + \
-                ("QD%d Read Exceedance,,QD%d Write Exceedance,,," % (qd, qd))
-            line2 = line2 + "rdusec,rdpct,wrusec,wrpct,,"
-        AppendFile(line1, csv)
-        AppendFile(line2, csv)
-
-        files = []
-        for qd in qdList:
-            try:
-                r = open(TestName(testType, testWpct, testBS,
-                                  qd, testIOdepth) + ".exc.read.csv")
-            except:
-                r = None
-            try:
-                w = open(TestName(testType, testWpct, testBS,
-                                  qd, testIOdepth) + ".exc.write.csv")
-            except:
-                w = None
-            files.append([r, w])
-        while True:
-            all_empty = True
-            l = ""
-            for fset in files:
-                if fset[0] is None:
-                    a = ""
-                else:
-                    a = fset[0].readline().strip()
-                if fset[1] is None:
-                    b = ""
-                else:
-                    b = fset[1].readline().strip()
-                l += (a + ",", ",,")[not a]
-                l += (b + ",", ",,")[not b]
-                l += ','
-                all_empty = all_empty and (not a) and (not b)
-            AppendFile(l, csv)
-            if all_empty:
+            for rdwr in ("read", "write"):
+                try:
+                    with open(TestName(testType, testWpct, testBS, qd,
+                                       testIOdepth) + ".exc." + rdwr + ".csv") as f:
+                        cols.append([v.strip() for v in f.read().splitlines()])
+                except OSError:
+                    cols.append([])
+        # Stitch them side by side until the first row where all are empty
+        for cells in zip_longest(*cols, fillvalue=""):
+            if not any(cells):
                 break
+            l = []
+            for a, b in zip(cells[0::2], cells[1::2]):
+                l.append((a + ",", ",,")[not a])
+                l.append((b + ",", ",,")[not b])
+                l.append(',')
+            rows.append("".join(l))
+        rows.append(",,,,," * len(qdList))  # Closing all-empty row
+        AppendLines(rows, csv)
         return csv
 
     global odssrc, timeseriescsv, testcsv, physDrive, testcapacity, model, testoffset
     global serial, uname, fioVerString, odsdest, timeseriesclatcsv, timeseriesslatcsv
 
     xmlsrc = GetContentXMLFromODS(odssrc)
-    xmlsrc = ReplaceSheetWithCSV_regex("Timeseries", timeseriescsv, xmlsrc)
-    xmlsrc = ReplaceSheetWithCSV_regex(
-        "TimeseriesCLAT", timeseriesclatcsv, xmlsrc)
-    xmlsrc = ReplaceSheetWithCSV_regex(
-        "TimeseriesSLAT", timeseriesslatcsv, xmlsrc)
-    xmlsrc = ReplaceSheetWithCSV_regex("Tests", testcsv, xmlsrc)
+    # Fix up the template first, while it's still a small string.  The CSV
+    # sheets spliced in below are never materialized as one big string
+    # Remove draw:image references to deleted binary previews
+    xmlsrc = re.sub(b"<draw:image.*?/>", b"", xmlsrc, flags=re.DOTALL)
+    # OpenOffice doesn't recalculate these cells on load?!
+    xmlsrc = xmlsrc.replace(b"_DRIVE", XMLText(physDrive))
+    xmlsrc = xmlsrc.replace(b"_TESTCAP", XMLText(testcapacity))
+    xmlsrc = xmlsrc.replace(b"_MODEL", XMLText(model))
+    xmlsrc = xmlsrc.replace(b"_SERIAL", XMLText(serial))
+    xmlsrc = xmlsrc.replace(b"_OS", XMLText(uname))
+    xmlsrc = xmlsrc.replace(b"_FIO", XMLText(fioVerString))
+    parts = [xmlsrc]
+    parts = ReplaceSheetWithCSV("Timeseries", timeseriescsv, parts)
+    parts = ReplaceSheetWithCSV(
+        "TimeseriesCLAT", timeseriesclatcsv, parts)
+    parts = ReplaceSheetWithCSV(
+        "TimeseriesSLAT", timeseriesslatcsv, parts)
+    parts = ReplaceSheetWithCSV("Tests", testcsv, parts)
     # Potentially add exceedance data if we have it
     if fioOutputFormat == "json+":
         csv = CombineExceedanceCSV(
             [1, 4, 16, 32], "Rand", 30, 4096, 1, "exceedance30")
-        xmlsrc = ReplaceSheetWithCSV_regex("Exceedance", csv, xmlsrc)
-    # Remove draw:image references to deleted binary previews
-    xmlsrc = re.sub("<draw:image.*?/>", "", xmlsrc, flags=re.DOTALL)
-    # OpenOffice doesn't recalculate these cells on load?!
-    xmlsrc = xmlsrc.replace("_DRIVE", str(physDrive))
-    xmlsrc = xmlsrc.replace("_TESTCAP", str(testcapacity))
-    xmlsrc = xmlsrc.replace("_MODEL", str(model))
-    xmlsrc = xmlsrc.replace("_SERIAL", str(serial))
-    xmlsrc = xmlsrc.replace("_OS", str(uname))
-    xmlsrc = xmlsrc.replace("_FIO", str(fioVerString))
-    UpdateContentXMLToODS_text(odssrc, odsdest, xmlsrc)
+        parts = ReplaceSheetWithCSV("Exceedance", csv, parts)
+    UpdateContentXMLToODS_text(odssrc, odsdest, parts)
 
 
 fio = ""          # FIO executable
@@ -1416,7 +1612,7 @@ fioOutputFormat = "json"  # Can we make exceedance charts using JSON+ output?
 cluster = False   # Running multiple jobs in a cluster using fio --server
 physDrive = ""    # Device path to test
 physDriveTxt = ""  # Unadulterated drive line
-physDriveDict = OrderedDict()  # Device path to test
+physDriveDict = {}  # Device path to test
 utilization = ""  # Device utilization % 1..100
 offset = ""       # Test region offset % 0..99
 yes = False       # Skip user verification
@@ -1452,7 +1648,42 @@ exceedancecsv = ""  # Intermediate exceedance output CSV
 odssrc = ""  # Original ODS spreadsheet file
 odsdest = ""  # Generated results ODS spreadsheet file
 
+# FIO jobfiles are short lived, keep them in RAM when possible
+jobfileDir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+# Drive naming patterns for the ParseArgs mount check
+partRE = re.compile('.*p?[1-9][0-9]*$')  # Name ends in a partition number
+nvmeRE = re.compile('.*/nvme[0-9]+n[1-9][0-9]*$')  # Whole NVME namespace
+sdpRE = re.compile('^/dev/sdp.*$')  # /dev/sdp*, whose "p" isn't a partition
+trailNumRE = re.compile('[1-9][0-9]*$')  # Trailing partition number
+partNumRE = re.compile('p?[1-9][0-9]*$')  # Trailing [p]partition number
+
+# Plain decimal/exponent numbers that can become float cells in the ODS
+numberRE = re.compile(rb'^-?[0-9]+(\.[0-9]+)?([eE][-+]?[0-9]+)?$')
+# A whole CSV row of such numbers, checked in one pass before per-cell tests
+numRowRE = re.compile(rb'^-?[0-9]+(\.[0-9]+)?([eE][-+]?[0-9]+)?'
+                      rb'(,-?[0-9]+(\.[0-9]+)?([eE][-+]?[0-9]+)?)*$')
+# XML special characters, escaped in one C-level pass by str.translate().
+# Template placeholders also land in attribute values, so quotes count too
+xmlEscape = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;',
+                           '"': '&quot;'})
+
+# Static ODS XML, built once instead of on every CSVtoXMLSheet call
+odsMimetype = "application/vnd.oasis.opendocument.spreadsheet"
+odsStoreMax = 1024  # ODS members smaller than this are stored, not deflated
+odsSheetStart = (b'<table:table table:name="%s" table:style-name="ta1" > '
+                 b'<table:table-column table:style-name="co1" '
+                 b'table:default-cell-style-name="Default"/>')
+odsRowStart = b'<table:table-row table:style-name="ro1">'
+odsRowEnd = b'</table:table-row>'
+odsFloatCell = (b'<table:table-cell%s office:value-type="float" '
+                b'office:value="%s"><text:p>%s</text:p></table:table-cell>')
+odsStringCell = (b'<table:table-cell%s office:value-type="string" '
+                 b'><text:p>%s</text:p></table:table-cell>')
+odsRepeat = b' table:number-columns-repeated="%d"'
+
 oc = []  # The list of tests to run
+pbszCache = {}  # Physical block size by device, 0 if unknown
 aioNeeded = 4096  # Minimum AIO kernel setting to run all tests
 
 # These globals are used to return the output results of the test thread
@@ -0,0 +1,62 @@
+"""Checks on the ODS spreadsheet ezfio generates from its CSV files."""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import zipfile
+from xml.dom import minidom
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import ezfio  # noqa: E402
+
+
+class GenerateResultODSTest(unittest.TestCase):
+    """Build an ODS from minimal CSVs and read it back."""
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        ezfio.odssrc = os.path.join(os.path.dirname(ezfio.__file__),
+                                    "original.ods")
+        ezfio.odsdest = os.path.join(self.dir, "out.ods")
+        ezfio.fioOutputFormat = "json"
+        for name in ("testcsv", "timeseriescsv", "timeseriesclatcsv",
+                     "timeseriesslatcsv"):
+            csv = os.path.join(self.dir, name + ".csv")
+            with open(csv, "w") as f:
+                f.write("Drive,_MODEL\n1,2.5,1e3\n,,\n")
+            setattr(ezfio, name, csv)
+        ezfio.physDrive = "/dev/nvme0n1"
+        ezfio.testcapacity = 100
+        ezfio.serial = "S/N & 1"
+        ezfio.uname = "Linux <test>"
+        ezfio.fioVerString = "fio-3.28"
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def testQuotedModelRoundTrips(self):
+        """XML specials in drive info, quotes included, stay well-formed."""
+        ezfio.model = 'Model <&> "x"'
+        ezfio.GenerateResultODS()
+        with zipfile.ZipFile(ezfio.odsdest) as z:
+            self.assertEqual(z.namelist()[0], "mimetype")
+            content = minidom.parseString(z.read("content.xml"))
+        values = [c.getAttribute("office:string-value")
+                  for c in content.getElementsByTagName("table:table-cell")]
+        self.assertIn(ezfio.model, values)
+        self.assertIn(ezfio.serial, values)
+
+    def testMissingCSVLeavesNoOutput(self):
+        """A sheet CSV that can't be read leaves no partial ODS behind."""
+        ezfio.model = "Model"
+        ezfio.timeseriesslatcsv = os.path.join(self.dir, "missing.csv")
+        with self.assertRaises(FileNotFoundError):
+            ezfio.GenerateResultODS()
+        self.assertEqual(os.listdir(self.dir),
+                         [f for f in os.listdir(self.dir)
+                          if not f.startswith("out.ods")])
+
+
+if __name__ == "__main__":
+    unittest.main()